@@ -1,49 +1,255 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from contextlib import asynccontextmanager
+from pydantic import BaseModel, Field, field_validator
 import os
 import openai
 from dotenv import load_dotenv
-from typing import List, Dict, Any
-import requests
+from typing import List, Dict, Any, Optional
+import asyncio
+import httpx
 import re
+import hashlib
+import json
+import logging
+from functools import partial
+from cachetools import TTLCache
+from diskcache import Cache
+import redis.asyncio as redis
+from semantic_cache import SemanticCache, EMBEDDING_MODEL
+
+log = logging.getLogger(__name__)
 
 # Load the correct env file
 load_dotenv("key.env")
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
-app = FastAPI()
+client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=30.0, max_retries=2)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One shared client so RxNav calls don't block the event loop and reuse connections;
+    # HTTP/2 lets concurrent lookups share a single TLS connection
+    app.state.http = httpx.AsyncClient(http2=True, timeout=10.0, limits=httpx.Limits(max_connections=100, max_keepalive_connections=10))
+    yield
+    await app.state.http.aclose()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
+# Response caches are only enabled when a Redis (Stack, for vector search) instance is configured.
+# Interaction reports only ever match the exact same medication list, so they use plain keys;
+# drug info is looked up semantically so different spellings of a drug can share an answer
+REDIS_URL = os.getenv("REDIS_URL")
+interactions_cache = redis.Redis.from_url(REDIS_URL) if REDIS_URL else None
+INTERACTIONS_CACHE_TTL = 4 * 60 * 60
+drug_info_cache = SemanticCache(REDIS_URL, "drug_info") if REDIS_URL else None
+
+# /drug-info answers shared between patients with similar demographics
+drug_info_bucket_cache = TTLCache(maxsize=10_000, ttl=3600)
+
+# RxCUI codes don't change, so lookups are persisted across restarts
+rxcui_cache = Cache(os.getenv("RXCUI_CACHE_DIR", "/tmp/rxcui_cache"))
+RXCUI_CACHE_TTL = 30 * 24 * 60 * 60
+
+# Upper bound on /drug-info-batch size and on how many of its LLM calls run at once
+MAX_BATCH_MEDICATIONS = 10
+BATCH_CONCURRENCY = 4
 
 class MedsRequest(BaseModel):
     medications: List[str]
 
+    @field_validator("medications")
+    @classmethod
+    def strip_medications(cls, v: List[str]) -> List[str]:
+        # Normalized once here so prompts, lookups and cache keys can use the names as-is
+        return [m.strip() for m in v if m.strip()]
+
 class DrugInfoRequest(BaseModel):
     medication: str
     personal_info: Dict[str, Any]  # height, weight, age, is_pregnant
 
-def get_rxcui(drug_name):
-    """Get RxCUI code for a given drug"""
+    @field_validator("medication")
+    @classmethod
+    def strip_medication(cls, v: str) -> str:
+        return v.strip()
+
+class DrugInfoBatchRequest(MedsRequest):
+    medications: List[str] = Field(max_length=MAX_BATCH_MEDICATIONS)
+    personal_info: Dict[str, Any]  # height, weight, age, is_pregnant
+
+class ExplanationResponse(BaseModel):
+    explanation: str
+
+class ExplanationsResponse(BaseModel):
+    explanations: List[str]
+
+async def fetch_rxcui(drug_name):
+    """Get RxCUI code for a given drug from RxNav"""
     url = f"https://rxnav.nlm.nih.gov/REST/rxcui.json?name={drug_name}"
-    resp = requests.get(url)
+    resp = await app.state.http.get(url)
     rxcui = resp.json().get("idGroup", {}).get("rxnormId", [])
     return rxcui[0] if rxcui else None
 
-def get_interactions(rxcui_list):
+async def get_rxcui(drug_name):
+    """Get RxCUI code for a given drug, from the on-disk cache when it has been looked up before"""
+    key = drug_name.strip().lower()
+    rxcui = rxcui_cache.get(key)
+    if rxcui is not None:
+        return rxcui
+    rxcui = await fetch_rxcui(key)
+    if rxcui is not None:
+        rxcui_cache.set(key, rxcui, expire=RXCUI_CACHE_TTL)
+    return rxcui
+
+async def get_all_rxcuis(drug_names: List[str]) -> List[Optional[str]]:
+    """Get RxCUI codes for several drugs concurrently, in input order"""
+    return await asyncio.gather(*(get_rxcui(d) for d in drug_names))
+
+async def get_rxnav_interactions(rxcui_list):
     """Get interactions for a list of RxCUIs"""
     rxcuis = "+".join(rxcui_list)
     url = f"https://rxnav.nlm.nih.gov/REST/interaction/list.json?rxcuis={rxcuis}"
-    resp = requests.get(url)
+    resp = await app.state.http.get(url)
     if resp.status_code != 200:
         raise HTTPException(status_code=resp.status_code, detail="Error fetching interactions from RxNav")
-    # Debugging to check response
-    print(resp.json())
-    return resp.json()
+    data = resp.json()
+    # Debugging to check response; formatted only when debug logging is enabled
+    log.debug("RxNav response: %s", data)
+    return data
 
-def build_prompt(meds: List[str]) -> str:
-    meds_str = ", ".join(meds)
-    prompt = f"""
+def normalize_medications(meds: List[str]) -> str:
+    """Order- and case-insensitive form of an already stripped medication list, used for the cache key"""
+    return ", ".join(sorted(m.lower() for m in meds))
+
+def interactions_cache_key(meds: List[str]) -> str:
+    """Redis key so an interaction report is only reused for the same set of medications"""
+    return "interactions:report:" + hashlib.sha256(normalize_medications(meds).encode("utf-8")).hexdigest()
+
+def patient_bucket(personal_info: Dict[str, Any]) -> tuple:
+    """Coarse patient demographics: age range, weight range (10 kg), integer BMI and pregnancy.
+
+    Children and adults 65+ keep their exact age and weight (to the kg), since dosing
+    advice changes within those ranges and children are often dosed per kg.
+    """
+    height_cm = personal_info.get("height", 170)
+    weight_kg = personal_info.get("weight", 70)
+    age = personal_info.get("age")
+    age = 30 if age is None else int(age)
+    bmi = weight_kg / ((height_cm / 100) ** 2)
+    if 18 <= age < 65:
+        # Decades, with 18-19 and 60-64 cut short by the exact-age ranges on either side
+        low = max(age // 10 * 10, 18)
+        age_range = f"{low}-{min(age // 10 * 10 + 9, 64)}"
+        weight_low = int(weight_kg // 10) * 10
+        weight_range = f"{weight_low}-{weight_low + 9} kg"
+    else:
+        age_range = str(age)
+        weight_range = f"{weight_kg:.0f} kg"
+    return (age_range, weight_range, int(bmi), bool(personal_info.get("is_pregnant", False)))
+
+def personal_info_scope(personal_info: Dict[str, Any]) -> str:
+    """Cache scope for a patient's demographic bucket.
+
+    The drug-info prompt is built from the bucket rather than the exact details, so
+    answers are only shared between patients whose prompts are identical.
+    """
+    return hashlib.sha256(json.dumps(patient_bucket(personal_info)).encode("utf-8")).hexdigest()
+
+def drug_info_bucket(medication: str, personal_info: Dict[str, Any]) -> tuple:
+    """/drug-info cache key: the medication plus the patient's demographic bucket"""
+    return (medication.lower(),) + patient_bucket(personal_info)
+
+async def embed(text: str) -> List[float]:
+    """Embed a normalized query for semantic cache lookups"""
+    response = await client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    return response.data[0].embedding
+
+
+async def store_interactions(key: str, answer: str):
+    """Cache an interaction report, logging rather than raising on errors"""
+    try:
+        await interactions_cache.set(key, answer, ex=INTERACTIONS_CACHE_TTL)
+    except Exception:
+        log.warning("Interactions cache store failed", exc_info=True)
+
+async def semantic_lookup(cache: SemanticCache, query: str, scope: str = ""):
+    """Embed a query and look it up in a semantic cache, returning (embedding, cached answer).
+
+    Embedding and Redis errors are logged and treated as a cache miss, so an outage
+    only costs the cache rather than the request.
+    """
+    try:
+        embedding = await embed(query)
+    except Exception:
+        log.warning("Embedding for semantic cache lookup failed", exc_info=True)
+        return None, None
+    try:
+        return embedding, await cache.lookup(embedding, scope)
+    except Exception:
+        log.warning("Semantic cache lookup failed", exc_info=True)
+        return embedding, None
+
+async def semantic_store(cache: SemanticCache, embedding: Optional[List[float]], scope: str, answer: str):
+    """Store an answer in a semantic cache, logging rather than raising on errors"""
+    if embedding is None:
+        return
+    try:
+        await cache.store(embedding, answer, scope)
+    except Exception:
+        log.warning("Semantic cache store failed", exc_info=True)
+
+async def chat(model: str, system: str, user: str, max_tokens: int, temperature: float) -> str:
+    """Run a chat completion and return the stripped answer"""
+    response = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": user}
+        ],
+        max_tokens=max_tokens,
+        temperature=temperature
+    )
+    return response.choices[0].message.content.strip()
+
+async def replay_lines(text: str):
+    for line in text.split("\n"):
+        yield line
+
+async def stream_chat(model: str, system: str, user: str, max_tokens: int, temperature: float):
+    """Start a streamed chat completion and return an async iterator over its lines"""
+    # Awaited here rather than inside the generator so API errors surface before the response starts
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": user}
+        ],
+        max_tokens=max_tokens,
+        temperature=temperature,
+        stream=True
+    )
+
+    async def lines():
+        buffer = ""
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            buffer += delta
+            *complete, buffer = buffer.split("\n")
+            for line in complete:
+                yield line
+        yield buffer
+
+    return lines()
+
+# Static prompt text is built once; only the patient-specific parts are filled in per request
+INTERACTIONS_PROMPT_PREFIX = """
 You are a licensed clinical pharmacist tasked with explaining potential drug interactions to patients in plain English.
 
-The patient has listed the following medications: {meds_str}
+The patient has listed the following medications: """
+
+INTERACTIONS_PROMPT_SUFFIX = """
 
 Your job is to:
 
@@ -59,15 +265,15 @@ Your job is to:
 
 Format the response STRICTLY like this :
 
-**Interaction 1**: {{Drug A}} + {{Drug B}}
+**Interaction 1**: {Drug A} + {Drug B}
 
-**Severity**: {{mild/moderate/severe}}
+**Severity**: {mild/moderate/severe}
 
-**What happens**: {{brief mechanism}}
+**What happens**: {brief mechanism}
 
-**Risks or symptoms**: {{patient-friendly explanation}}
+**Risks or symptoms**: {patient-friendly explanation}
 
-**Advice**: {{recommendation or safer alternative}}
+**Advice**: {recommendation or safer alternative}
 
 If there are no known interactions, respond with:
 >No known interactions were found between these medications. Always check with a doctor or pharmacist.
@@ -78,31 +284,16 @@ You must capitalize the first letter of each medication.
 
 Begin when ready.
 """
-    return prompt
 
-def build_drug_info_prompt(medication: str, personal_info: Dict[str, Any]) -> str:
-    height_cm = personal_info.get("height", 170)
-    weight_kg = personal_info.get("weight", 70)
-    age = personal_info.get("age", 30)
-    is_pregnant = personal_info.get("is_pregnant", False)
-    
-    # Get display values if available (imperial), otherwise convert from metric
-    height_display = personal_info.get("height_display", f"{height_cm:.0f} cm")
-    weight_display = personal_info.get("weight_display", f"{weight_kg:.0f} kg")
-    
-    bmi = weight_kg / ((height_cm / 100) ** 2)
-    pregnancy_text = "The patient is currently pregnant." if is_pregnant else "The patient is not pregnant."
-    
-    prompt = f"""
+DRUG_INFO_PROMPT = """
 You are a licensed clinical pharmacist providing comprehensive drug information to a patient.
 
 The patient is asking about: {medication}
 
 Patient information:
 - Age: {age} years
-- Height: {height_display}
-- Weight: {weight_display}
-- BMI: {bmi:.1f}
+- Weight: {weight}
+- BMI: {bmi}
 - {pregnancy_text}
 
 Please provide detailed pharmaceutical information in the following format:
@@ -119,7 +310,7 @@ Please provide detailed pharmaceutical information in the following format:
 
 **Side Effects**: {{Common side effects patients should be aware of, organized by frequency (very common, common, uncommon)}}
 
-{f"**Pregnancy**: {{Safety information for pregnancy, FDA pregnancy category if known, risks to mother and fetus, alternative medications if this drug should be avoided}}" if is_pregnant else ""}
+{pregnancy_section}
 
 Guidelines:
 1. Use simple, patient-friendly language
@@ -136,72 +327,228 @@ Capitalize the first letter of the medication name.
 
 Begin when ready.
 """
-    return prompt
-
-def uppercase_severity(text):
-    # Replace '**Severity**: value' with uppercase value
-    def repl(match):
-        return f"**Severity**: {match.group(1).upper()}"
-    return re.sub(r"\*\*Severity\*\*: (mild|moderate|severe|unknown)", repl, text, flags=re.IGNORECASE)
-
-def capitalize_medications(text):
-    # Capitalize the first letter of each medication in '**Interaction N**: ...' line
-    def repl(match):
-        drugs = match.group(2)
-        # Split by +, strip, capitalize first letter of each drug
-        drugs_cap = ' + '.join([d.strip().capitalize() for d in drugs.split('+')])
-        return f"**Interaction {match.group(1)}**: {drugs_cap}"
-    return re.sub(r"\*\*Interaction (\d+)\*\*: ([^\n]+)", repl, text)
+
+PREGNANCY_SECTION = "**Pregnancy**: {{Safety information for pregnancy, FDA pregnancy category if known, risks to mother and fetus, alternative medications if this drug should be avoided}}"
+
+# Pregnancy-dependent text is baked in up front, leaving one ready-to-format template per case
+DRUG_INFO_PROMPT_PREGNANT = (
+    DRUG_INFO_PROMPT
+    .replace("{pregnancy_text}", "The patient is currently pregnant.")
+    .replace("{pregnancy_section}", PREGNANCY_SECTION)
+)
+DRUG_INFO_PROMPT_NOT_PREGNANT = (
+    DRUG_INFO_PROMPT
+    .replace("{pregnancy_text}", "The patient is not pregnant.")
+    .replace("{pregnancy_section}", "")
+)
+
+def build_prompt(meds: List[str]) -> str:
+    return INTERACTIONS_PROMPT_PREFIX + ", ".join(meds) + INTERACTIONS_PROMPT_SUFFIX
+
+def build_drug_info_prompt(medication: str, personal_info: Dict[str, Any]) -> str:
+    # Built from the patient's bucket rather than the exact details, so every patient
+    # served a bucket-cached answer gets one generated for the same inputs; the
+    # medication keeps the capitalization it was entered with
+    age_range, weight_range, bmi, is_pregnant = patient_bucket(personal_info)
+    
+    template = DRUG_INFO_PROMPT_PREGNANT if is_pregnant else DRUG_INFO_PROMPT_NOT_PREGNANT
+    return template.format(
+        medication=medication,
+        age=age_range,
+        weight=weight_range,
+        bmi=bmi
+    )
+
+# Post-processing patterns, compiled once at import rather than per request
+MULTI_NEWLINE_RE = re.compile(r"\n{3,}")
+MULTI_SPACE_RE = re.compile(r" +")
+
+# The LLM writes severities as e.g. "mild" or "Mild"; both are uppercased with plain
+# str.replace, which avoids a Python callback per regex match
+SEVERITY_REPLACEMENTS = [
+    (f"**Severity**: {value}", f"**Severity**: {sev.upper()}")
+    for sev in ("mild", "moderate", "severe", "unknown")
+    for value in (sev, sev.capitalize())
+]
+
+def postprocess_interactions(text):
+    """Collapse blank lines and spaces, uppercase severities and capitalize drug names"""
+    text = MULTI_NEWLINE_RE.sub("\n\n", text)
+    text = MULTI_SPACE_RE.sub(" ", text)
+    for old, new in SEVERITY_REPLACEMENTS:
+        text = text.replace(old, new)
+    # Capitalize the first letter of each medication in '**Interaction N**: ...' lines
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        if line.startswith("**Interaction "):
+            header, sep, drugs = line.partition("**: ")
+            if sep and header[len("**Interaction "):].isdigit():
+                lines[i] = header + sep + ' + '.join([d.strip().capitalize() for d in drugs.split('+')])
+    return "\n".join(lines)
 
 def clean_drug_info_response(text):
     """Clean and format the drug information response"""
     # Remove extra blank lines, ensure consistent formatting
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r" +", " ", text)
+    text = MULTI_NEWLINE_RE.sub("\n\n", text)
+    text = MULTI_SPACE_RE.sub(" ", text)
     return text.strip()
 
-@app.post("/interactions")
+async def stream_explanation(lines, clean_line, on_complete=None):
+    """Re-emit answer lines as Server-Sent Events, one line per event.
+
+    Each line is cleaned as it arrives and runs of blank lines are collapsed, so
+    joining the event data with newlines gives the same text as the JSON endpoint.
+    The finished text is passed to the optional on_complete coroutine function.
+    """
+    out = []
+    pending_blank = False
+    async for line in lines:
+        line = clean_line(line)
+        if not line.strip():
+            pending_blank = bool(out)
+            continue
+        if pending_blank:
+            out.append("")
+            yield "data: \n\n"
+            pending_blank = False
+        out.append(line)
+        yield f"data: {line}\n\n"
+    if on_complete:
+        await on_complete("\n".join(out))
+
+def clean_drug_info_line(line):
+    return MULTI_SPACE_RE.sub(" ", line)
+
+def interactions_chat(meds: List[str]) -> Dict[str, Any]:
+    return dict(
+        model="gpt-4o-mini",
+        system="You are a helpful clinical pharmacist.",
+        user=build_prompt(meds),
+        max_tokens=600,
+        temperature=0.7
+    )
+
+def drug_info_chat(medication: str, personal_info: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(
+        model="gpt-4o-mini",
+        system="You are a helpful clinical pharmacist providing comprehensive drug information.",
+        user=build_drug_info_prompt(medication, personal_info),
+        max_tokens=800,
+        temperature=0.3  # Lower temperature for more consistent, factual information
+    )
+
+async def lookup_interactions(meds: List[str]):
+    """Cached interaction report for a medication list, returning (cached answer, store).
+
+    store is a coroutine function that caches a freshly generated report, or None when
+    caching is disabled. Redis errors are logged and treated as a miss.
+    """
+    if not interactions_cache:
+        return None, None
+    key = interactions_cache_key(meds)
+    store = partial(store_interactions, key)
+    try:
+        cached = await interactions_cache.get(key)
+    except Exception:
+        log.warning("Interactions cache lookup failed", exc_info=True)
+        return None, store
+    return (cached.decode("utf-8") if cached is not None else None), store
+
+async def store_drug_info(bucket, embedding, scope, answer):
+    drug_info_bucket_cache[bucket] = answer
+    if drug_info_cache:
+        await semantic_store(drug_info_cache, embedding, scope, answer)
+
+async def lookup_drug_info(medication: str, personal_info: Dict[str, Any]):
+    """Cached drug information for one medication, returning (cached answer, store) like lookup_interactions"""
+    bucket = drug_info_bucket(medication, personal_info)
+    cached = drug_info_bucket_cache.get(bucket)
+    if cached is not None:
+        return cached, None
+
+    embedding = None
+    scope = ""
+    if drug_info_cache:
+        scope = personal_info_scope(personal_info)
+        embedding, cached = await semantic_lookup(drug_info_cache, medication.lower(), scope)
+    return cached, partial(store_drug_info, bucket, embedding, scope)
+
+async def stream_response(cached, store, chat, clean_line):
+    """SSE response replaying a cached answer, or streaming a fresh one and storing it once finished"""
+    if cached is not None:
+        lines, store = replay_lines(cached), None
+    else:
+        lines = await stream_chat(**chat)
+    return StreamingResponse(stream_explanation(lines, clean_line, store), media_type="text/event-stream")
+
+@app.post("/interactions", response_model=ExplanationResponse)
 async def get_interactions(request: MedsRequest):
-    prompt = build_prompt(request.medications)
-
     try:
-        response = openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a helpful clinical pharmacist."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=600,
-            temperature=0.7
-        )
-        answer = response.choices[0].message.content.strip()
+        cached, store = await lookup_interactions(request.medications)
+        if cached is not None:
+            return {"explanation": cached}
+
+        answer = await chat(**interactions_chat(request.medications))
         # Post-process: remove extra blank lines, ensure double newlines between sections
-        answer = re.sub(r"\n{3,}", "\n\n", answer)
-        answer = re.sub(r" +", " ", answer)
-        answer = uppercase_severity(answer)
-        answer = capitalize_medications(answer)
+        answer = postprocess_interactions(answer)
+        if store:
+            await store(answer)
         return {"explanation": answer}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/drug-info")
+async def explain_drug(medication: str, personal_info: Dict[str, Any]) -> str:
+    """Drug information for one medication, from the caches when possible"""
+    cached, store = await lookup_drug_info(medication, personal_info)
+    if cached is not None:
+        return cached
+
+    answer = await chat(**drug_info_chat(medication, personal_info))
+    answer = clean_drug_info_response(answer)
+    await store(answer)
+    return answer
+
+@app.post("/drug-info", response_model=ExplanationResponse)
 async def get_drug_info(request: DrugInfoRequest):
-    prompt = build_drug_info_prompt(request.medication, request.personal_info)
+    try:
+        return {"explanation": await explain_drug(request.medication, request.personal_info)}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/drug-info-batch", response_model=ExplanationsResponse)
+async def get_drug_info_batch(request: DrugInfoBatchRequest):
+    """Drug information for several medications in one request, generated concurrently"""
+    limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def explain(medication):
+        async with limit:
+            return await explain_drug(medication, request.personal_info)
 
     try:
-        response = openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a helpful clinical pharmacist providing comprehensive drug information."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=800,
-            temperature=0.3  # Lower temperature for more consistent, factual information
-        )
-        answer = response.choices[0].message.content.strip()
-        answer = clean_drug_info_response(answer)
-        return {"explanation": answer}
+        explanations = await asyncio.gather(*(explain(m) for m in request.medications))
+        return {"explanations": explanations}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/interactions/stream")
+async def stream_interactions(request: MedsRequest):
+    """Same as /interactions, but streams the explanation as it is generated"""
+    try:
+        cached, store = await lookup_interactions(request.medications)
+        return await stream_response(cached, store, interactions_chat(request.medications), postprocess_interactions)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/drug-info/stream")
+async def stream_drug_info(request: DrugInfoRequest):
+    """Same as /drug-info, but streams the explanation as it is generated"""
+    try:
+        cached, store = await lookup_drug_info(request.medication, request.personal_info)
+        return await stream_response(cached, store, drug_info_chat(request.medication, request.personal_info), clean_drug_info_line)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,73 @@
+import uuid
+from array import array
+from typing import List, Optional
+
+import redis.asyncio as redis
+from redis.exceptions import ResponseError
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+
+class SemanticCache:
+    """Redis vector-search cache mapping query embeddings to LLM explanations"""
+
+    def __init__(self, redis_url: str, namespace: str, distance_threshold: float = 0.08, ttl: int = 4 * 60 * 60):
+        self.redis = redis.Redis.from_url(redis_url)
+        self.index = f"{namespace}:idx"
+        self.prefix = f"{namespace}:"
+        self.distance_threshold = distance_threshold
+        self.ttl = ttl
+        self._index_ready = False
+
+    async def _ensure_index(self):
+        if self._index_ready:
+            return
+        try:
+            await self.redis.execute_command("FT.INFO", self.index)
+        except ResponseError:
+            try:
+                await self.redis.execute_command(
+                    "FT.CREATE", self.index, "ON", "HASH", "PREFIX", 1, self.prefix,
+                    "SCHEMA",
+                    "scope", "TAG",
+                    "embedding", "VECTOR", "HNSW", 6,
+                    "TYPE", "FLOAT32", "DIM", EMBEDDING_DIM, "DISTANCE_METRIC", "COSINE",
+                )
+            except ResponseError as e:
+                # Concurrent first requests can both miss FT.INFO; whoever loses the race is fine
+                if "already exists" not in str(e).lower():
+                    raise
+        self._index_ready = True
+
+    async def lookup(self, embedding: List[float], scope: str = "") -> Optional[str]:
+        """Return the cached explanation for the nearest embedding, if close enough.
+
+        Only entries stored under the same scope are considered, so inputs that
+        must match exactly (e.g. patient details) never cross-hit.
+        """
+        await self._ensure_index()
+        base = f"@scope:{{{scope}}}" if scope else "*"
+        result = await self.redis.execute_command(
+            "FT.SEARCH", self.index, f"{base}=>[KNN 1 @embedding $vec AS distance]",
+            "PARAMS", 2, "vec", array("f", embedding).tobytes(),
+            "RETURN", 2, "explanation", "distance",
+            "DIALECT", 2,
+        )
+        if not result or result[0] == 0:
+            return None
+        fields = dict(zip(result[2][::2], result[2][1::2]))
+        if float(fields[b"distance"]) > self.distance_threshold:
+            return None
+        return fields[b"explanation"].decode("utf-8")
+
+    async def store(self, embedding: List[float], explanation: str, scope: str = ""):
+        """Store an explanation under its embedding, expiring after the cache TTL"""
+        await self._ensure_index()
+        key = f"{self.prefix}{uuid.uuid4().hex}"
+        mapping = {"embedding": array("f", embedding).tobytes(), "explanation": explanation}
+        if scope:
+            mapping["scope"] = scope
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
@@ -8,13 +8,14 @@ This Streamlit app allows users to:
 How it works:
 - Users can switch between "Drug Interactions" and "Drug Information" tabs.
 - Interaction tab: Enter medications (comma separated) and get interaction explanations.
-- Drug Info tab: Enter a single drug and get comprehensive pharmaceutical information.
+- Drug Info tab: Enter one or more drugs (comma separated) and get comprehensive pharmaceutical information.
 - Both tabs send requests to corresponding FastAPI backend endpoints.
 
 Key features:
 - Input validation: Warns if no medications are entered.
 - Error handling: Displays API errors and connection issues.
-- Loading spinner: Shows while waiting for backend response.
+- Loading placeholder: Shows while waiting for backend response, without blocking the other tab.
+- Background requests: Queries from both tabs run concurrently and their results persist across reruns.
 - Personalized dosing: Considers pregnancy status, height, and weight for dosage recommendations.
 
 Usage:
@@ -23,103 +24,207 @@ Usage:
 - Choose your desired tab and enter medication information.
 """
 
+import os
 import streamlit as st
 import requests
+import orjson
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 API_URL_INTERACTIONS = "http://localhost:8000/interactions"
 API_URL_DRUG_INFO = "http://localhost:8000/drug-info"
+API_URL_DRUG_INFO_BATCH = "http://localhost:8000/drug-info-batch"
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Show raw/parsed response expanders; Streamlit ships their content even when collapsed
+DEBUG = os.getenv("DRUG_APP_DEBUG", "").lower() in {"1", "true", "yes"}
+# Generous read timeout: the backend may retry a slow LLM call before answering
+REQUEST_TIMEOUT = 120
+# Backend calls in flight across all sessions; each session runs at most one per tab
+QUERY_WORKERS = 16
+# Seconds between checks on whether a pending query has finished
+POLL_INTERVAL = 0.5
+# Most medications per drug information query; matches the backend's MAX_BATCH_MEDICATIONS
+MAX_DRUG_INFO_MEDICATIONS = 10
 
-st.title("Drug Information & Interaction Explainer")
-
-# --- Disclaimer ---
-st.markdown("""
+DISCLAIMER_HTML = """
 <div style='background:#fff3cd; border-left:6px solid #f9a825; padding:12px 18px; border-radius:8px; margin-bottom:18px; color:#222;'>
 <b>Disclaimer:</b> This is not medical advice from a doctor. Always consult your doctor before taking any medications.
 </div>
-""", unsafe_allow_html=True)
+"""
+
+# Accent color and emoji for each severity, checked in order
+SEVERITY_STYLES = {
+    "severe": ("#b71c1c", "🛑"),
+    "moderate": ("#f9a825", "⚠️"),
+    "mild": ("#388e3c", "✅"),
+}
+UNKNOWN_SEVERITY_STYLE = ("#343a40", "❓")
+
+st.title("Drug Information & Interaction Explainer")
+
+# --- Disclaimer ---
+st.markdown(DISCLAIMER_HTML, unsafe_allow_html=True)
 
 # --- Create Tabs ---
 tab1, tab2 = st.tabs(["🔍 Drug Interactions", "💊 Drug Information"])
 
 # --- Helper Functions ---
+@st.cache_resource
+def get_executor():
+    """
+    Worker threads for backend calls, shared by all browser sessions.
+    Queries run in the background and their futures live in st.session_state, so a
+    query submitted in one tab keeps running while the user submits another.
+    Sized by QUERY_WORKERS so several users' slow queries can run side by side.
+    """
+    return ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="backend-query")
+
+def submit_query(key, fn, *args):
+    """
+    Run fn(*args) in the background and store its future in st.session_state[key].
+    A query still waiting on the one it replaces is cancelled; one already running
+    finishes in the background and its result is ignored.
+    """
+    previous = st.session_state.get(key)
+    if previous is not None:
+        previous.cancel()
+    st.session_state[key] = get_executor().submit(fn, *args)
+
+@st.fragment(run_every=POLL_INTERVAL)
+def wait_for_query(key, message):
+    """
+    Placeholder shown while the query in st.session_state[key] is still running.
+    Only this fragment reruns while waiting, so the script never blocks on the backend
+    and the other tab's button stays responsive; once the query has finished the whole
+    app reruns to render its result.
+    """
+    if st.session_state[key].done():
+        st.rerun()
+    st.info(f"⏳ {message}")
+
+@st.cache_resource
+def get_session():
+    """
+    Shared HTTP session for backend calls.
+    Created once per process (not per rerun) so keep-alive connections are pooled and reused.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=QUERY_WORKERS, max_retries=1)
+    session.mount("http://", adapter)
+    return session
+
+def post_json(url, payload):
+    """
+    POST a JSON payload to a backend endpoint and return the decoded JSON response.
+    Raises requests.HTTPError on API errors.
+    """
+    response = get_session().post(url, data=orjson.dumps(payload), headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_interactions(meds):
+    """
+    Ask the backend to explain interactions between a tuple of medications.
+    Cached per medication tuple, so repeating a query skips the backend round-trip.
+    Raises requests.HTTPError on API errors (which are not cached).
+    """
+    return post_json(API_URL_INTERACTIONS, {"medications": meds}).get("explanation", "")
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_drug_info(medication, personal_info):
+    """
+    Ask the backend for information about a medication, personalized to the patient.
+    Cached per (medication, personal_info) like fetch_interactions.
+    """
+    return post_json(API_URL_DRUG_INFO, {"medication": medication, "personal_info": personal_info}).get("explanation", "")
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_drug_info_batch(meds, personal_info):
+    """
+    Ask the backend for information about several medications in one request.
+    Returns one explanation per medication, in order. Cached like fetch_drug_info.
+    """
+    return post_json(API_URL_DRUG_INFO_BATCH, {"medications": meds, "personal_info": personal_info}).get("explanations", [])
+
+def fetch_drug_infos(meds, personal_info):
+    """
+    Get one explanation per medication, using the batch endpoint when there is more than one.
+    """
+    if len(meds) == 1:
+        return [fetch_drug_info(meds[0], personal_info)]
+    return fetch_drug_info_batch(tuple(meds), personal_info)
+
+# Section headers within an interaction record and the dict key each one fills
+INTERACTION_SECTIONS = {
+    "**Severity**:": "severity",
+    "**What happens**:": "what",
+    "**Risks or symptoms**:": "risks",
+    "**Advice**:": "advice",
+}
+DRUG_INFO_SECTION_RE = re.compile(r'\*\*(Description|Uses|Side Effects|Dosage|Names|Pregnancy|Personalized Dose)\*\*:')
+
+# Parsers are pure functions of the explanation text, so results are reused across
+# Streamlit reruns; st.cache_data hands back a fresh copy of the returned dicts each time
+@st.cache_data(show_spinner=False)
 def parse_interactions(explanation):
     """
     Parse the explanation text into a list of interaction dicts with sections.
     - Unescapes asterisks so section headers are recognized
     - Handles the case where there are no interactions
-    - Splits by '**Interaction' and then by single newlines for sections
+    - Scans the lines once, starting a new record at each '**Interaction' header
     """
-    explanation = explanation.replace(r"\*\*", "**")
-    if explanation.strip().startswith('>'):
+    if r"\*\*" in explanation:
+        explanation = explanation.replace(r"\*\*", "**")
+    if explanation.lstrip()[:1] == '>':
         # No interactions found
         return [{"severity": "info", "interaction": "", "what": "", "risks": "", "advice": "", "message": explanation.strip()}]
     interactions = []
-    blocks = re.split(r"\n\*\*Interaction", explanation)   
-    for block in blocks:
-        block = block.strip()
-        if not block:
+    inter = None
+    for line in explanation.splitlines():
+        # Blank separator lines are most of the output; drop them before stripping
+        if not line or line.isspace():
             continue
-        block = "**Interaction" + block if not block.startswith("**Interaction") else block
-        sections = re.split(r"\n", block)
-        inter = {"interaction": "", "severity": "", "what": "", "risks": "", "advice": "", "message": ""}
-        for sec in sections:
-            sec = sec.strip()
-            if not sec:
-                continue
-            # Parse each section by its header
-            if sec.startswith("**Interaction"):
-                inter["interaction"] = re.sub(r"^\*\*Interaction ?\d+\*\*: ?", "", sec).strip()
-            elif sec.startswith("**Severity**:"):
-                inter["severity"] = re.sub(r"^\*\*Severity\*\*: ?", "", sec).strip()
-            elif sec.startswith("**What happens**:"):
-                inter["what"] = re.sub(r"^\*\*What happens\*\*: ?", "", sec).strip()
-            elif sec.startswith("**Risks or symptoms**:"):
-                inter["risks"] = re.sub(r"^\*\*Risks or symptoms\*\*: ?", "", sec).strip()
-            elif sec.startswith("**Advice**:"):
-                inter["advice"] = re.sub(r"^\*\*Advice\*\*: ?", "", sec).strip()
-        interactions.append(inter)
+        line = line.strip()
+        if line.startswith("**Interaction"):
+            # Drug names follow '**Interaction N**:', or '**Interaction N:**' when the colon is bolded
+            _, sep, drugs = line.partition("**:")
+            if not sep:
+                drugs = line[2:].partition("**")[2] or line
+            inter = {"interaction": drugs.strip(), "severity": "", "what": "", "risks": "", "advice": "", "message": ""}
+            interactions.append(inter)
+        elif inter is not None:
+            for header, key in INTERACTION_SECTIONS.items():
+                if line.startswith(header):
+                    inter[key] = line[len(header):].strip()
+                    break
     return interactions
 
+@st.cache_data(show_spinner=False)
 def parse_drug_info(explanation):
     """
     Parse the drug information text into structured sections.
     This function now handles multi-line sections properly.
     """
-    explanation = explanation.replace(r"\*\*", "**")
+    if r"\*\*" in explanation:
+        explanation = explanation.replace(r"\*\*", "**")
     
     # Initialize the drug info dictionary
     drug_info = {"description": "", "uses": "", "side_effects": "", "dosage": "", "names": "", "pregnancy": "", "personalized_dose": ""}
     
     # Split by double asterisk headers
-    sections = re.split(r'\*\*(Description|Uses|Side Effects|Dosage|Names|Pregnancy|Personalized Dose)\*\*:', explanation)
+    sections = DRUG_INFO_SECTION_RE.split(explanation)
     
     # Process the sections
     for i in range(1, len(sections), 2):
         if i + 1 < len(sections):
             section_name = sections[i].lower().replace(" ", "_")
-            section_content = sections[i + 1].strip()
-            
-            # Clean up the content - remove extra newlines but keep paragraph structure
-            section_content = re.sub(r'\n\s*\n', ' ', section_content)
-            section_content = re.sub(r'\n', ' ', section_content)
-            section_content = section_content.strip()
+            # Clean up the content - join lines and paragraphs with single spaces
+            section_content = ' '.join(sections[i + 1].split())
             
-            # Map section names to our dictionary keys
-            if section_name == "description":
-                drug_info["description"] = section_content
-            elif section_name == "uses":
-                drug_info["uses"] = section_content
-            elif section_name == "side_effects":
-                drug_info["side_effects"] = section_content
-            elif section_name == "dosage":
-                drug_info["dosage"] = section_content
-            elif section_name == "names":
-                drug_info["names"] = section_content
-            elif section_name == "pregnancy":
-                drug_info["pregnancy"] = section_content
-            elif section_name == "personalized_dose":
-                drug_info["personalized_dose"] = section_content
+            # Section names map directly onto the dictionary keys
+            if section_name in drug_info:
+                drug_info[section_name] = section_content
     
     return drug_info
 
@@ -142,12 +247,14 @@ def format_interaction_text(inter, emoji):
 
 def format_drug_info_section(title, content, icon):
     """
-    Format a drug information section in a styled box.
+    Build the HTML for a drug information section in a styled box.
+    - Returns an empty string when there is no content
+    - Returned (unindented) rather than rendered so all sections can be sent in one st.markdown call
     """
     if not content:
-        return
+        return ""
     
-    st.markdown(f"""
+    return f"""
         <div style='border:2px solid #4CAF50; border-radius:12px; margin-bottom:18px; background:#1e1e1e;'>
             <div style='height:8px; background:#4CAF50; border-top-left-radius:10px; border-top-right-radius:10px;'></div>
             <div style='padding:18px;'>
@@ -155,36 +262,71 @@ def format_drug_info_section(title, content, icon):
                 <span style='font-size:1.05em; color:#f9f9f9; line-height:1.6;'>{content}</span>
             </div>
         </div>
-    """, unsafe_allow_html=True)
+    """.strip()
 
 def severity_box(severity, inter):
     """
-    Display a single interaction in a modern, eye-catching colored box with accent bar and emoji.
+    Build the HTML for a single interaction in a modern, eye-catching colored box with accent bar and emoji.
     - Severity determines color and emoji
     - Uses HTML for custom styling
+    - Returned (unindented) rather than rendered so all boxes can be sent in one st.markdown call
     """
     sev = severity.lower()
-    if inter.get("message"):
-        st.info(inter["message"])
-        return
-    # Set accent color and emoji by severity
-    if "severe" in sev:
-        accent = "#b71c1c"; emoji = "🛑"
-    elif "moderate" in sev:
-        accent = "#f9a825"; emoji = "⚠️"
-    elif "mild" in sev:
-        accent = "#388e3c"; emoji = "✅"
-    else:
-        accent = "#343a40"; emoji = "❓"
+    # Set accent color and emoji by severity; the backend normally sends exactly one
+    # severity word, so try a single dict lookup before scanning for it in longer text
+    style = SEVERITY_STYLES.get(sev.strip())
+    if style is None:
+        style = next((style for key, style in SEVERITY_STYLES.items() if key in sev), UNKNOWN_SEVERITY_STYLE)
+    accent, emoji = style
     box_bg = "#22272e"
-    st.markdown(f"""
+    return f"""
         <div style='border:2.5px solid {accent}; border-radius:12px; margin-bottom:18px; box-shadow:0 2px 8px rgba(0,0,0,0.08); background:{box_bg};'>
             <div style='height:12px; background:{accent}; border-top-left-radius:10px; border-top-right-radius:10px;'></div>
             <div style='padding:18px;'>
                 {format_interaction_text(inter, emoji)}
             </div>
         </div>
-    """, unsafe_allow_html=True)
+    """.strip()
+
+def render_drug_info(explanation, is_pregnant):
+    """
+    Display one medication's drug information as styled sections.
+    - Pregnancy section only shown when the query was for a pregnant patient
+    - Falls back to the raw text if no sections could be parsed
+    """
+    # Debug: Show raw response (set DRUG_APP_DEBUG=1)
+    if DEBUG:
+        with st.expander("Debug: Raw API Response"):
+            st.code(explanation, language="markdown")
+    
+    drug_info = parse_drug_info(explanation)
+    
+    # Debug: Show parsed sections (set DRUG_APP_DEBUG=1)
+    if DEBUG:
+        with st.expander("Debug: Parsed Sections"):
+            st.json(drug_info)
+    
+    # Display each section with icons - only show if content exists
+    html_parts = [
+        format_drug_info_section("Description", drug_info["description"], "📋"),
+        format_drug_info_section("Medical Uses", drug_info["uses"], "🎯"),
+        format_drug_info_section("Generic & Brand Names", drug_info["names"], "🏷️"),
+        format_drug_info_section("Standard Dosage", drug_info["dosage"], "💊"),
+        format_drug_info_section("Personalized Dosage Recommendation", drug_info["personalized_dose"], "👤"),
+        format_drug_info_section("Common Side Effects", drug_info["side_effects"], "⚠️"),
+    ]
+    
+    if is_pregnant:
+        html_parts.append(format_drug_info_section("Pregnancy Considerations", drug_info["pregnancy"], "🤱"))
+    
+    html_parts = [part for part in html_parts if part]
+    if html_parts:
+        st.markdown("\n".join(html_parts), unsafe_allow_html=True)
+    
+    # Fallback: if no sections were parsed, show raw response
+    if not any(drug_info.values()):
+        st.warning("Unable to parse response into sections. Showing raw response:")
+        st.text(explanation)
 
 # --- Drug Interactions Tab ---
 with tab1:
@@ -195,22 +337,8 @@ with tab1:
         if meds_input:
             # Split and clean input
             meds = [m.strip() for m in meds_input.split(",") if m.strip()]
-            with st.spinner("Contacting your pharmacist..."):
-                try:
-                    response = requests.post(API_URL_INTERACTIONS, json={"medications": meds})
-                    if response.status_code == 200:
-                        explanation = response.json().get("explanation", "")
-                        st.markdown("### Interaction Explanation")
-                        interactions = parse_interactions(explanation)
-                        if not interactions:
-                            st.info("No interactions found.")
-                        for inter in interactions:
-                            severity_box(inter["severity"], inter)
-                            st.markdown("---")  # Divider between interactions
-                    else:
-                        st.error(f"API error: {response.text}")
-                except Exception as e:
-                    st.error(f"Error connecting to backend: {e}")
+            # Sorted so the same medications in any order share a cache entry
+            submit_query("interactions_future", fetch_interactions, tuple(sorted(meds)))
         else:
             st.warning("Please enter at least one medication.")
 
@@ -219,7 +347,7 @@ with tab2:
     st.header("Get Drug Information")
     
     # Drug input
-    drug_input = st.text_input("Enter a medication name:")
+    drug_input = st.text_input("Enter one or more medications (comma separated):")
     
     # Personal information for dosage calculation
     st.subheader("Personal Information (for dosage recommendations)")
@@ -235,7 +363,11 @@ with tab2:
         age = st.number_input("Age (years)", min_value=1, max_value=120, value=30, step=1)
 
     if st.button("Get Drug Information", key="drug_info_btn"):
-        if drug_input:
+        # Split and clean input the same way as the interactions tab
+        drug_meds = [m.strip() for m in drug_input.split(",") if m.strip()]
+        if len(drug_meds) > MAX_DRUG_INFO_MEDICATIONS:
+            st.warning(f"Please enter at most {MAX_DRUG_INFO_MEDICATIONS} medications at a time.")
+        elif drug_meds:
             # Convert imperial to metric for backend calculations
             height_cm = (height_feet * 12 + height_inches) * 2.54
             weight_kg = weight * 0.453592
@@ -244,56 +376,64 @@ with tab2:
                 "height": height_cm,
                 "weight": weight_kg,
                 "age": age,
-                "is_pregnant": is_pregnant,
-                "height_display": f"{height_feet}'{height_inches}\"",
-                "weight_display": f"{weight} lbs"
+                "is_pregnant": is_pregnant
             }
             
-            with st.spinner("Gathering pharmaceutical information..."):
-                try:
-                    response = requests.post(API_URL_DRUG_INFO, json={
-                        "medication": drug_input.strip(),
-                        "personal_info": personal_info
-                    })
-                    if response.status_code == 200:
-                        explanation = response.json().get("explanation", "")
-                        st.markdown("### Drug Information")
-                        
-                        # Debug: Show raw response (you can remove this later)
-                        with st.expander("Debug: Raw API Response"):
-                            st.text(explanation)
-                        
-                        drug_info = parse_drug_info(explanation)
-                        
-                        # Debug: Show parsed sections (you can remove this later)
-                        with st.expander("Debug: Parsed Sections"):
-                            st.json(drug_info)
-                        
-                        # Display each section with icons - only show if content exists
-                        if drug_info["description"]:
-                            format_drug_info_section("Description", drug_info["description"], "📋")
-                        if drug_info["uses"]:
-                            format_drug_info_section("Medical Uses", drug_info["uses"], "🎯")
-                        if drug_info["names"]:
-                            format_drug_info_section("Generic & Brand Names", drug_info["names"], "🏷️")
-                        if drug_info["dosage"]:
-                            format_drug_info_section("Standard Dosage", drug_info["dosage"], "💊")
-                        if drug_info["personalized_dose"]:
-                            format_drug_info_section("Personalized Dosage Recommendation", drug_info["personalized_dose"], "👤")
-                        if drug_info["side_effects"]:
-                            format_drug_info_section("Common Side Effects", drug_info["side_effects"], "⚠️")
-                        
-                        if is_pregnant and drug_info["pregnancy"]:
-                            format_drug_info_section("Pregnancy Considerations", drug_info["pregnancy"], "🤱")
-                        
-                        # Fallback: if no sections were parsed, show raw response
-                        if not any(drug_info.values()):
-                            st.warning("Unable to parse response into sections. Showing raw response:")
-                            st.text(explanation)
-                            
-                    else:
-                        st.error(f"API error: {response.text}")
-                except Exception as e:
-                    st.error(f"Error connecting to backend: {e}")
+            submit_query("drug_info_future", fetch_drug_infos, drug_meds, personal_info)
+            st.session_state["drug_info_meds"] = drug_meds
+            st.session_state["drug_info_pregnant"] = is_pregnant
+        else:
+            st.warning("Please enter a medication name.")
+
+# --- Results ---
+# Only finished queries are rendered; pending ones are polled by wait_for_query, so
+# the script never waits on the backend and a query from either tab can be submitted
+# while the other is still running.
+interactions_future = st.session_state.get("interactions_future")
+if interactions_future is not None:
+    with tab1:
+        if not interactions_future.done():
+            wait_for_query("interactions_future", "Contacting your pharmacist...")
+        else:
+            try:
+                explanation = interactions_future.result()
+                st.markdown("### Interaction Explanation")
+                interactions = parse_interactions(explanation)
+                if not interactions:
+                    st.info("No interactions found.")
+                html_parts = []
+                for inter in interactions:
+                    if inter.get("message"):
+                        st.info(inter["message"])
+                        continue
+                    html_parts.append(severity_box(inter["severity"], inter))
+                    html_parts.append("<hr>")  # Divider between interactions
+                if html_parts:
+                    st.markdown("\n".join(html_parts), unsafe_allow_html=True)
+            except requests.HTTPError as e:
+                st.error(f"API error: {e.response.text}")
+            except Exception as e:
+                st.error(f"Error connecting to backend: {e}")
+
+drug_info_future = st.session_state.get("drug_info_future")
+if drug_info_future is not None:
+    with tab2:
+        if not drug_info_future.done():
+            wait_for_query("drug_info_future", "Gathering pharmaceutical information...")
         else:
-            st.warning("Please enter a medication name.")
\ No newline at end of file
+            try:
+                explanations = drug_info_future.result()
+                st.markdown("### Drug Information")
+                drug_meds = st.session_state["drug_info_meds"]
+                if len(explanations) != len(drug_meds):
+                    st.error(f"Expected information for {len(drug_meds)} medications but received {len(explanations)}.")
+                    explanations = []
+                for med, explanation in zip(drug_meds, explanations):
+                    if len(drug_meds) > 1:
+                        st.markdown(f"#### {med.capitalize()}")
+                    # Uses the pregnancy status the query was submitted with
+                    render_drug_info(explanation, st.session_state["drug_info_pregnant"])
+            except requests.HTTPError as e:
+                st.error(f"API error: {e.response.text}")
+            except Exception as e:
+                st.error(f"Error connecting to backend: {e}")